@@ -0,0 +1,221 @@
+import asyncio
+import bisect
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from config import Config
+from portfolio_risk import PortfolioRisk
+from position_manager import Position
+
+
+# Matches the RiskManager sizing tiers.
+EDGE_BUCKET_BOUNDS = (0.05, 0.07, 0.10)
+EDGE_BUCKET_LABELS = ("<0.05", "0.05-0.07", "0.07-0.10", ">=0.10")
+UNKNOWN_EDGE_BUCKET = "unknown"
+
+_QUEUE_MAXSIZE = 10_000
+
+
+@dataclass(frozen=True, slots=True)
+class FillEvent:
+    market_id: str
+    side: str               # "buy" or "sell"
+    size: float
+    price: float
+    quote_price: Optional[float]  # market.yes_price when the order was sent, if known
+    edge: Optional[float] = None
+    reason: str = ""
+    ts: float = 0.0
+
+
+@dataclass(slots=True)
+class _Lot:
+    shares: float
+    entry_price: float
+    edge_bucket: str
+
+
+@dataclass(slots=True)
+class _BucketStats:
+    trades: int = 0
+    wins: int = 0
+    realized_pnl: float = 0.0
+
+
+def edge_bucket(edge: Optional[float]) -> str:
+    if edge is None:
+        return UNKNOWN_EDGE_BUCKET
+    return EDGE_BUCKET_LABELS[bisect.bisect_right(EDGE_BUCKET_BOUNDS, edge)]
+
+
+class TradeAnalytics:
+    # Consumes position and fill events from a bounded queue and keeps only
+    # running aggregates plus one lot per open position. Marks and
+    # unrealized PnL come from PortfolioRisk rather than being tracked twice.
+
+    def __init__(self, config: Config, logger, portfolio: PortfolioRisk):
+        self._config = config
+        self._logger = logger
+        self._portfolio = portfolio
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_MAXSIZE)
+        self._dropped = 0
+
+        self._lots: Dict[str, _Lot] = {}
+        # Lots whose position closed but whose exit fill is not applied yet.
+        self._closing: Dict[str, _Lot] = {}
+        self._realized_pnl = 0.0
+        self._trades = 0
+        self._wins = 0
+        self._unresolved = 0
+        self._fills = 0
+        self._slippage_sum = 0.0
+        self._slippage_abs_max = 0.0
+        self._buckets: Dict[str, _BucketStats] = {}
+
+    def _publish(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._dropped += 1
+
+    def on_position_opened(self, pos: Position):
+        self._publish(("open", pos))
+
+    def on_position_closed(self, pos: Position):
+        self._publish(("close", pos))
+
+    def record_fill(self, event: FillEvent):
+        self._publish(event)
+
+    def record_unresolved_exit(self, market_id: str):
+        self._publish(("unresolved", market_id))
+
+    async def run(self):
+        while True:
+            event = await self._queue.get()
+            try:
+                if isinstance(event, FillEvent):
+                    self._apply_fill(event)
+                else:
+                    kind, payload = event
+                    if kind == "open":
+                        self._apply_open(payload)
+                    elif kind == "close":
+                        self._apply_close(payload)
+                    else:
+                        self._closing.pop(payload, None)
+                        self._unresolved += 1
+            except Exception as e:
+                self._logger.error(f"Error applying analytics event {event!r}: {e}")
+
+    def _apply_open(self, pos: Position):
+        if pos.entry_price <= 0:
+            return
+        self._lots[pos.market_id] = _Lot(
+            shares=pos.size / pos.entry_price,
+            entry_price=pos.entry_price,
+            edge_bucket=UNKNOWN_EDGE_BUCKET,
+        )
+
+    def _apply_close(self, pos: Position):
+        lot = self._lots.pop(pos.market_id, None)
+        if lot is not None:
+            self._closing[pos.market_id] = lot
+
+    def _apply_fill(self, event: FillEvent):
+        if event.quote_price is not None:
+            self._fills += 1
+            # Positive slippage means we paid more (buy) or received less (sell) than quoted.
+            slippage = event.price - event.quote_price if event.side == "buy" else event.quote_price - event.price
+            self._slippage_sum += slippage
+            self._slippage_abs_max = max(self._slippage_abs_max, abs(slippage))
+
+        if event.side == "buy":
+            lot = self._lots.get(event.market_id)
+            if lot is not None:
+                lot.edge_bucket = edge_bucket(event.edge)
+            return
+
+        lot = self._closing.pop(event.market_id, None)
+        if lot is None:
+            return
+        pnl = lot.shares * (event.price - lot.entry_price)
+        self._realized_pnl += pnl
+        self._trades += 1
+        bucket = self._buckets.get(lot.edge_bucket)
+        if bucket is None:
+            bucket = self._buckets[lot.edge_bucket] = _BucketStats()
+        bucket.trades += 1
+        bucket.realized_pnl += pnl
+        if pnl > 0:
+            self._wins += 1
+            bucket.wins += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "ts": time.time(),
+            "realized_pnl": self._realized_pnl,
+            "open_positions": len(self._lots),
+            "trades": self._trades,
+            "win_rate": self._wins / self._trades if self._trades else None,
+            "unresolved_exits": self._unresolved,
+            "quoted_fills": self._fills,
+            "avg_slippage": self._slippage_sum / self._fills if self._fills else None,
+            "max_abs_slippage": self._slippage_abs_max,
+            "edge_buckets": {
+                label: {
+                    "trades": b.trades,
+                    "hit_ratio": b.wins / b.trades if b.trades else None,
+                    "realized_pnl": b.realized_pnl,
+                }
+                for label, b in self._buckets.items()
+            },
+            "portfolio": self._portfolio.snapshot(),
+            "pending_events": self._queue.qsize(),
+            "dropped_events": self._dropped,
+        }
+
+    def _append_snapshot(self, line: str):
+        with open(self._config.analytics_file, "a") as f:
+            f.write(line + "\n")
+
+    async def export_periodically(self):
+        while True:
+            await asyncio.sleep(self._config.analytics_snapshot_interval)
+            line = json.dumps(self.snapshot(), separators=(",", ":"))
+            try:
+                await asyncio.to_thread(self._append_snapshot, line)
+            except Exception as e:
+                self._logger.error(f"Error writing analytics snapshot: {e}")
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            # Any request gets the current snapshot; headers are ignored.
+            await asyncio.wait_for(reader.readline(), timeout=5)
+            body = json.dumps(self.snapshot()).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except Exception as e:
+            self._logger.debug(f"Analytics endpoint request failed: {e}")
+        finally:
+            writer.close()
+
+    async def serve(self):
+        try:
+            server = await asyncio.start_server(
+                self._handle_http, self._config.analytics_host, self._config.analytics_port
+            )
+        except OSError as e:
+            self._logger.error(f"Could not start analytics endpoint: {e}")
+            return
+        self._logger.info(
+            f"Analytics endpoint listening on http://{self._config.analytics_host}:{self._config.analytics_port}/"
+        )
+        async with server:
+            await server.serve_forever()
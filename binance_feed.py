@@ -1,7 +1,8 @@
 import asyncio
+import importlib
 import json
-import websockets
-from typing import Optional
+import time
+from typing import Optional, Tuple
 
 
 BINANCE_WS_URL = "wss://stream.binance.com:9443/ws/btcusdt@trade"
@@ -11,10 +12,15 @@ class BinancePriceFeed:
     def __init__(self, logger):
         self._logger = logger
         self._price: Optional[float] = None
+        self._price_time: Optional[float] = None
+        self._has_price = asyncio.Event()
         self._lock = asyncio.Lock()
         self._stop_event = asyncio.Event()
 
     async def start(self):
+        # Deferred import, done off the event loop so it overlaps with startup.
+        websockets = await asyncio.to_thread(importlib.import_module, "websockets")
+
         while not self._stop_event.is_set():
             try:
                 self._logger.info("Connecting to Binance websocket...")
@@ -37,6 +43,8 @@ class BinancePriceFeed:
             price = float(price_str)
             async with self._lock:
                 self._price = price
+                self._price_time = time.time()
+            self._has_price.set()
             self._logger.debug(f"Binance BTCUSDT price update: {price}")
         except Exception as e:
             self._logger.error(f"Error parsing Binance message: {e}")
@@ -45,5 +53,22 @@ class BinancePriceFeed:
         async with self._lock:
             return self._price
 
+    async def get_price_with_time(self) -> Tuple[Optional[float], Optional[float]]:
+        async with self._lock:
+            return self._price, self._price_time
+
+    async def seed_price(self, price: float, price_time: float):
+        # A persisted price is only used until the first live tick arrives.
+        async with self._lock:
+            if self._price is not None:
+                return
+            self._price = price
+            self._price_time = price_time
+        self._has_price.set()
+        self._logger.info(f"Seeded BTC price from snapshot: {price}")
+
+    async def wait_for_price(self):
+        await self._has_price.wait()
+
     async def stop(self):
         self._stop_event.set()
@@ -1,9 +1,5 @@
 import os
 from dataclasses import dataclass
-from dotenv import load_dotenv
-
-# Load environment variables from .env if present
-load_dotenv()
 
 
 @dataclass(frozen=True)
@@ -17,6 +13,25 @@ class Config:
     log_file: str
     market_refresh_interval: int = 60  # seconds
     main_loop_sleep: float = 0.25      # seconds (250ms)
+    max_portfolio_percent: float = 0.8       # cap on total open notional / balance
+    max_expiry_bucket_percent: float = 0.6   # cap on open notional per expiry hour / balance
+    pre_expiry_exit_seconds: float = 60.0    # flatten this long before expiry, 0 disables
+    max_holding_seconds: float = 3600.0      # force exit after holding this long, 0 disables
+    settlement_grace_seconds: float = 120.0  # reconcile still-open positions after expiry
+    snapshot_file: str = "limitless_bot_snapshot.json"
+    snapshot_interval: float = 15.0          # seconds between warm-cache snapshots, 0 disables
+    snapshot_max_age: float = 60.0           # ignore snapshot prices/markets older than this
+    analytics_host: str = "127.0.0.1"
+    analytics_port: int = 8787               # local analytics endpoint, 0 disables
+    analytics_file: str = "limitless_bot_analytics.jsonl"
+    analytics_snapshot_interval: float = 60.0  # seconds between exported snapshots, 0 disables
+    event_loop: str = "asyncio"              # "asyncio" or "uvloop"
+    executor_workers: int = 0                # to_thread pool size, 0 uses the asyncio default
+    watchdog_interval: float = 0.5           # seconds between loop-lag probes, 0 disables
+    loop_lag_warn_ms: float = 100.0          # warn when a probe wakes up this late
+    loop_stall_ms: float = 1000.0            # capture the loop thread's stack past this
+    loop_debug: bool = False                 # asyncio debug mode, logs slow callbacks
+    slow_callback_ms: float = 100.0
 
 
 def _get_bool(env_name: str, default: bool) -> bool:
@@ -27,6 +42,12 @@ def _get_bool(env_name: str, default: bool) -> bool:
 
 
 def load_config() -> Config:
+    # Imported here so modules that only need the Config type stay light.
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env if present
+    load_dotenv()
+
     api_key = os.getenv("LIMITLESS_API_KEY", "").strip()
     if not api_key:
         raise RuntimeError("LIMITLESS_API_KEY is not set in environment")
@@ -35,8 +56,27 @@ def load_config() -> Config:
     take_profit_percent = float(os.getenv("TAKE_PROFIT_PERCENT", "0.03"))
     paper_trading = _get_bool("PAPER_TRADING", True)
     max_position_percent = float(os.getenv("MAX_POSITION_PERCENT", "0.6"))
+    max_portfolio_percent = float(os.getenv("MAX_PORTFOLIO_PERCENT", "0.8"))
+    max_expiry_bucket_percent = float(os.getenv("MAX_EXPIRY_BUCKET_PERCENT", "0.6"))
     log_level = os.getenv("LOG_LEVEL", "INFO").upper()
     log_file = os.getenv("LOG_FILE", "limitless_bot.log")
+    pre_expiry_exit_seconds = float(os.getenv("PRE_EXPIRY_EXIT_SECONDS", "60"))
+    max_holding_seconds = float(os.getenv("MAX_HOLDING_SECONDS", "3600"))
+    settlement_grace_seconds = float(os.getenv("SETTLEMENT_GRACE_SECONDS", "120"))
+    snapshot_file = os.getenv("SNAPSHOT_FILE", "limitless_bot_snapshot.json")
+    snapshot_interval = float(os.getenv("SNAPSHOT_INTERVAL", "15"))
+    snapshot_max_age = float(os.getenv("SNAPSHOT_MAX_AGE", "60"))
+    analytics_host = os.getenv("ANALYTICS_HOST", "127.0.0.1")
+    analytics_port = int(os.getenv("ANALYTICS_PORT", "8787"))
+    analytics_file = os.getenv("ANALYTICS_FILE", "limitless_bot_analytics.jsonl")
+    analytics_snapshot_interval = float(os.getenv("ANALYTICS_SNAPSHOT_INTERVAL", "60"))
+    event_loop = os.getenv("EVENT_LOOP", "asyncio").strip().lower()
+    executor_workers = int(os.getenv("EXECUTOR_WORKERS", "0"))
+    watchdog_interval = float(os.getenv("WATCHDOG_INTERVAL", "0.5"))
+    loop_lag_warn_ms = float(os.getenv("LOOP_LAG_WARN_MS", "100"))
+    loop_stall_ms = float(os.getenv("LOOP_STALL_MS", "1000"))
+    loop_debug = _get_bool("LOOP_DEBUG", False)
+    slow_callback_ms = float(os.getenv("SLOW_CALLBACK_MS", "100"))
 
     return Config(
         limitless_api_key=api_key,
@@ -46,4 +86,23 @@ def load_config() -> Config:
         max_position_percent=max_position_percent,
         log_level=log_level,
         log_file=log_file,
+        max_portfolio_percent=max_portfolio_percent,
+        max_expiry_bucket_percent=max_expiry_bucket_percent,
+        pre_expiry_exit_seconds=pre_expiry_exit_seconds,
+        max_holding_seconds=max_holding_seconds,
+        settlement_grace_seconds=settlement_grace_seconds,
+        snapshot_file=snapshot_file,
+        snapshot_interval=snapshot_interval,
+        snapshot_max_age=snapshot_max_age,
+        analytics_host=analytics_host,
+        analytics_port=analytics_port,
+        analytics_file=analytics_file,
+        analytics_snapshot_interval=analytics_snapshot_interval,
+        event_loop=event_loop,
+        executor_workers=executor_workers,
+        watchdog_interval=watchdog_interval,
+        loop_lag_warn_ms=loop_lag_warn_ms,
+        loop_stall_ms=loop_stall_ms,
+        loop_debug=loop_debug,
+        slow_callback_ms=slow_callback_ms,
     )
@@ -1,23 +1,66 @@
-from typing import List, Tuple, Dict
+import time
+from typing import Any, List, Optional, Tuple, Dict, Set
 
 from config import Config
 from market_discovery import MarketInfo
-from position_manager import PositionManager
+from position_manager import PositionManager, Position, EXIT_SETTLEMENT
+from portfolio_risk import PortfolioRisk
+from analytics import FillEvent, TradeAnalytics
 from limitless_client import LimitlessClient
 
 
+_EXIT_RETRY_SECONDS = 5.0
+
+
+def _fill_price(order: Any, fallback: Optional[float]) -> Optional[float]:
+    if isinstance(order, dict):
+        for key in ("avg_price", "fill_price", "price"):
+            value = order.get(key)
+            if value:
+                try:
+                    return float(value)
+                except (TypeError, ValueError):
+                    pass
+    return fallback
+
+
+def _settlement_price(outcome: Any) -> Optional[float]:
+    value = str(outcome).lower()
+    if value in ("yes", "true", "1"):
+        return 1.0
+    if value in ("no", "false", "0"):
+        return 0.0
+    return None
+
+
 class ExecutionEngine:
-    def __init__(self, config: Config, logger, client: LimitlessClient, position_manager: PositionManager):
+    def __init__(
+        self,
+        config: Config,
+        logger,
+        client: LimitlessClient,
+        position_manager: PositionManager,
+        portfolio: PortfolioRisk,
+        analytics: TradeAnalytics,
+    ):
         self._config = config
         self._logger = logger
         self._client = client
         self._positions = position_manager
+        self._portfolio = portfolio
+        self._analytics = analytics
 
     async def execute_entries(self, entries: List[Tuple[MarketInfo, float, float]]):
         for market, edge, size in entries:
             if self._positions.has_position(market.market_id):
                 continue
 
+            # Earlier entries in this batch have already been applied to the
+            # portfolio totals, so each order only gets the remaining room.
+            size = self._portfolio.clip_order(market, size)
+            if size <= 0:
+                continue
+
             self._logger.info(
                 f"ENTRY signal: market={market.market_id} title='{market.title}' edge={edge:.4f} size={size:.4f}"
             )
@@ -26,20 +69,37 @@ class ExecutionEngine:
                 self._logger.info(
                     f"[PAPER] Simulating buy_yes: market={market.market_id} size={size:.4f}"
                 )
-                self._positions.open_position(market, size, market.yes_price)
-                continue
-
-            order = await self._client.buy_yes(market.market_id, size)
-            if order is not None:
-                self._positions.open_position(market, size, market.yes_price)
-                self._logger.info(f"Live buy_yes order executed: {order}")
+                price = market.yes_price
             else:
-                self._logger.error(f"Live buy_yes order failed for market {market.market_id}")
+                order = await self._client.buy_yes(market.market_id, size)
+                if order is None:
+                    self._logger.error(f"Live buy_yes order failed for market {market.market_id}")
+                    continue
+                self._logger.info(f"Live buy_yes order executed: {order}")
+                price = _fill_price(order, market.yes_price)
 
-    async def execute_exits(self, markets: List[MarketInfo], edges_by_market: dict):
-        for m in markets:
-            pos = self._positions.get_position(m.market_id)
-            if not pos:
+            self._positions.open_position(market, size, price)
+            self._analytics.record_fill(
+                FillEvent(
+                    market_id=market.market_id,
+                    side="buy",
+                    size=size,
+                    price=price,
+                    quote_price=market.yes_price,
+                    edge=edge,
+                    reason="entry",
+                    ts=time.time(),
+                )
+            )
+
+    async def execute_exits(self, markets: Dict[str, MarketInfo], edges_by_market: dict):
+        handled = await self.execute_timed_exits(markets)
+
+        for pos in self._positions.positions():
+            if pos.market_id in handled:
+                continue
+            m = markets.get(pos.market_id)
+            if m is None:
                 continue
             current_edge = edges_by_market.get(m.market_id, 0.0)
             exit_pos = self._positions.evaluate_exit(m, m.yes_price, current_edge)
@@ -49,17 +109,96 @@ class ExecutionEngine:
             self._logger.info(
                 f"EXIT signal: market={m.market_id} size={exit_pos.size:.4f}"
             )
+            await self._exit_position(exit_pos, m.yes_price, "signal")
 
-            if self._config.paper_trading:
-                self._logger.info(
-                    f"[PAPER] Simulating sell_yes: market={m.market_id} size={exit_pos.size:.4f}"
+    async def execute_timed_exits(self, markets: Dict[str, MarketInfo]) -> Set[str]:
+        now = time.time()
+
+        # Several deadlines can come due for one market in the same tick;
+        # settlement wins, since a closed market can no longer be sold.
+        due: Dict[str, Tuple[Position, str]] = {}
+        for pos, reason in self._positions.due_exits(now):
+            if reason == EXIT_SETTLEMENT or pos.market_id not in due:
+                due[pos.market_id] = (pos, reason)
+        handled: Set[str] = set(due)
+
+        for pos, reason in due.values():
+            if reason == EXIT_SETTLEMENT:
+                await self._settle(pos, now)
+                continue
+
+            if pos.expiry_ts is not None and now >= pos.expiry_ts:
+                # Past expiry the sell cannot fill; the pending settlement
+                # deadline reconciles the position instead.
+                self._logger.debug(
+                    f"Skipping {reason} exit for expired market {pos.market_id}, awaiting settlement"
                 )
-                self._positions.close_position(m.market_id)
                 continue
 
-            order = await self._client.sell_yes(m.market_id, exit_pos.size)
-            if order is not None:
-                self._positions.close_position(m.market_id)
-                self._logger.info(f"Live sell_yes order executed: {order}")
-            else:
-                self._logger.error(f"Live sell_yes order failed for market {m.market_id}")
+            self._logger.info(
+                f"TIMED EXIT signal ({reason}): market={pos.market_id} size={pos.size:.4f}"
+            )
+            m = markets.get(pos.market_id)
+            quote = m.yes_price if m is not None else None
+            if not await self._exit_position(pos, quote, reason):
+                self._positions.retry_exit(pos.market_id, reason, now + _EXIT_RETRY_SECONDS)
+
+        return handled
+
+    async def _exit_position(self, pos: Position, quote: Optional[float], reason: str) -> bool:
+        if self._config.paper_trading:
+            self._logger.info(
+                f"[PAPER] Simulating sell_yes: market={pos.market_id} size={pos.size:.4f}"
+            )
+            price = quote
+        else:
+            order = await self._client.sell_yes(pos.market_id, pos.size)
+            if order is None:
+                self._logger.error(f"Live sell_yes order failed for market {pos.market_id}")
+                return False
+            self._logger.info(f"Live sell_yes order executed: {order}")
+            price = _fill_price(order, quote)
+
+        self._positions.close_position(pos.market_id)
+        if price is None:
+            # No quote and no reported fill price: the exit cannot be valued,
+            # and a made-up price would count as a real trade.
+            self._analytics.record_unresolved_exit(pos.market_id)
+        else:
+            self._record_exit(pos, price, quote, reason)
+        return True
+
+    def _record_exit(self, pos: Position, price: float, quote: Optional[float], reason: str):
+        self._analytics.record_fill(
+            FillEvent(
+                market_id=pos.market_id,
+                side="sell",
+                size=pos.size,
+                price=price,
+                quote_price=quote,
+                reason=reason,
+                ts=time.time(),
+            )
+        )
+
+    async def _settle(self, pos: Position, now: float):
+        # The market has expired with the position still open; it can no
+        # longer be sold, so record the final market state and drop it.
+        market = await self._client.get_market(pos.market_id)
+        if market is None:
+            self._positions.retry_exit(pos.market_id, EXIT_SETTLEMENT, now + _EXIT_RETRY_SECONDS)
+            return
+
+        status = market.get("status") if isinstance(market, dict) else None
+        outcome = (market.get("outcome") or market.get("result")) if isinstance(market, dict) else None
+        self._logger.info(
+            f"SETTLEMENT: market={pos.market_id} size={pos.size:.4f} entry_price={pos.entry_price:.4f} "
+            f"status={status} outcome={outcome}"
+        )
+        self._positions.close_position(pos.market_id)
+        price = _settlement_price(outcome)
+        if price is None:
+            # Counted separately so unknown outcomes don't skew win rate.
+            self._analytics.record_unresolved_exit(pos.market_id)
+        else:
+            self._record_exit(pos, price, None, EXIT_SETTLEMENT)
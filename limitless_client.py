@@ -1,8 +1,7 @@
 import asyncio
+import threading
 from typing import Any, Dict, List, Optional
 
-from limitless_sdk import Limitless
-
 from config import Config
 
 
@@ -10,14 +9,29 @@ class LimitlessClient:
     def __init__(self, config: Config, logger):
         self._config = config
         self._logger = logger
-        self._client = Limitless(api_key=config.limitless_api_key)
+        self._sdk_client = None
+        self._sdk_lock = threading.Lock()
+
+    def _sdk(self):
+        # The SDK is imported and constructed on first use, inside the worker
+        # thread, so startup and the event loop never wait on it.
+        if self._sdk_client is None:
+            with self._sdk_lock:
+                if self._sdk_client is None:
+                    from limitless_sdk import Limitless
+
+                    self._sdk_client = Limitless(api_key=self._config.limitless_api_key)
+        return self._sdk_client
+
+    def _invoke(self, method: str, *args, **kwargs):
+        return getattr(self._sdk(), method)(*args, **kwargs)
 
-    async def _call(self, func, *args, **kwargs):
-        return await asyncio.to_thread(func, *args, **kwargs)
+    async def _call(self, method: str, *args, **kwargs):
+        return await asyncio.to_thread(self._invoke, method, *args, **kwargs)
 
     async def get_markets(self) -> List[Dict[str, Any]]:
         try:
-            markets = await self._call(self._client.get_markets)
+            markets = await self._call("get_markets")
             return markets or []
         except Exception as e:
             self._logger.error(f"Error fetching markets from Limitless: {e}")
@@ -25,14 +39,14 @@ class LimitlessClient:
 
     async def get_market(self, market_id: str) -> Optional[Dict[str, Any]]:
         try:
-            return await self._call(self._client.get_market, market_id)
+            return await self._call("get_market", market_id)
         except Exception as e:
             self._logger.error(f"Error fetching market {market_id}: {e}")
             return None
 
     async def get_balance(self) -> float:
         try:
-            balance_info = await self._call(self._client.get_balance)
+            balance_info = await self._call("get_balance")
             if isinstance(balance_info, dict):
                 for key in ("available", "balance", "free"):
                     if key in balance_info:
@@ -45,7 +59,7 @@ class LimitlessClient:
     async def buy_yes(self, market_id: str, amount: float) -> Optional[Dict[str, Any]]:
         try:
             self._logger.info(f"Sending buy_yes order: market={market_id} amount={amount}")
-            return await self._call(self._client.buy_yes, market_id, amount)
+            return await self._call("buy_yes", market_id, amount)
         except Exception as e:
             self._logger.error(f"Error executing buy_yes on {market_id}: {e}")
             return None
@@ -53,7 +67,7 @@ class LimitlessClient:
     async def sell_yes(self, market_id: str, amount: float) -> Optional[Dict[str, Any]]:
         try:
             self._logger.info(f"Sending sell_yes order: market={market_id} amount={amount}")
-            return await self._call(self._client.sell_yes, market_id, amount)
+            return await self._call("sell_yes", market_id, amount)
         except Exception as e:
             self._logger.error(f"Error executing sell_yes on {market_id}: {e}")
             return None
@@ -1,7 +1,10 @@
 import asyncio
 import signal
+import time
 from typing import Dict
 
+_PROCESS_START = time.perf_counter()
+
 from config import load_config
 from logger import setup_logger
 from limitless_client import LimitlessClient
@@ -9,8 +12,12 @@ from binance_feed import BinancePriceFeed
 from market_discovery import MarketDiscovery
 from risk_manager import RiskManager
 from position_manager import PositionManager
+from portfolio_risk import PortfolioRisk
+from analytics import TradeAnalytics
 from strategy import StrategyEngine
 from execution import ExecutionEngine
+from snapshot import Snapshot, SnapshotStore
+from runtime import LoopWatchdog, run_event_loop
 
 
 class LimitlessBot:
@@ -23,6 +30,11 @@ class LimitlessBot:
         self._market_discovery = MarketDiscovery(self._client, self._config, self._logger)
         self._risk_manager = RiskManager(self._config, self._logger)
         self._position_manager = PositionManager(self._config, self._logger)
+        self._portfolio = PortfolioRisk(self._config, self._logger)
+        self._position_manager.add_listener(self._portfolio)
+        self._market_discovery.add_listener(self._portfolio)
+        self._analytics = TradeAnalytics(self._config, self._logger, self._portfolio)
+        self._position_manager.add_listener(self._analytics)
         self._strategy = StrategyEngine(
             self._config,
             self._logger,
@@ -35,9 +47,58 @@ class LimitlessBot:
             self._logger,
             self._client,
             self._position_manager,
+            self._portfolio,
+            self._analytics,
         )
 
+        self._snapshots = SnapshotStore(self._config, self._logger)
+        self._watchdog = LoopWatchdog(self._config, self._logger)
+
         self._should_stop = asyncio.Event()
+        self._ready = asyncio.Event()
+        self._warm_start = False
+
+    async def _restore_snapshot(self):
+        snapshot = await self._snapshots.load()
+        if snapshot is None:
+            self._logger.info("No usable snapshot found, cold start")
+            return
+
+        self._position_manager.restore_positions(snapshot.positions)
+        if snapshot.markets:
+            await self._market_discovery.restore_markets(snapshot.markets)
+        if snapshot.btc_price is not None:
+            await self._binance_feed.seed_price(snapshot.btc_price, snapshot.btc_price_time)
+        self._warm_start = bool(snapshot.markets) and snapshot.btc_price is not None
+
+    async def _save_snapshot(self):
+        btc_price, btc_price_time = await self._binance_feed.get_price_with_time()
+        market_index = await self._market_discovery.get_market_index()
+        await self._snapshots.save(
+            Snapshot(
+                saved_at=time.time(),
+                btc_price=btc_price,
+                btc_price_time=btc_price_time,
+                markets=list(market_index.values()),
+                positions=self._position_manager.positions(),
+            )
+        )
+
+    async def _periodic_snapshot(self):
+        while not self._should_stop.is_set():
+            await asyncio.sleep(self._config.snapshot_interval)
+            await self._save_snapshot()
+
+    async def _wait_until_ready(self):
+        await asyncio.gather(
+            self._binance_feed.wait_for_price(),
+            self._market_discovery.wait_for_markets(),
+        )
+        self._ready.set()
+        self._logger.info(
+            f"Bot READY after {(time.perf_counter() - _PROCESS_START) * 1000:.0f}ms "
+            f"({'warm' if self._warm_start else 'cold'} start)"
+        )
 
     async def _start_binance_feed(self):
         await self._binance_feed.start()
@@ -51,35 +112,70 @@ class LimitlessBot:
             await asyncio.sleep(self._config.market_refresh_interval)
 
     async def _main_loop(self):
+        # Deadline-driven exits run from the first tick; entries and
+        # edge-based exits wait until a price and a market book are available,
+        # and pause whenever the price is older than SNAPSHOT_MAX_AGE (a seeded
+        # snapshot price with the feed still down, or a dropped feed).
+        ready_task = asyncio.create_task(self._wait_until_ready(), name="wait_until_ready")
         self._logger.info("Starting main trading loop")
+        first_decision = True
+        price_stale = False
         while not self._should_stop.is_set():
             try:
-                btc_price = await self._binance_feed.get_price()
-                markets = await self._market_discovery.get_markets()
+                market_index = await self._market_discovery.get_market_index()
+                if self._ready.is_set():
+                    btc_price, price_time = await self._binance_feed.get_price_with_time()
+                    stale = price_time is None or time.time() - price_time > self._config.snapshot_max_age
+                    if stale != price_stale:
+                        if stale:
+                            self._logger.warning(
+                                f"BTC price is older than {self._config.snapshot_max_age:.0f}s, pausing entries and signal exits"
+                            )
+                        else:
+                            self._logger.info("BTC price is fresh again, resuming trading")
+                        price_stale = stale
+                if not self._ready.is_set() or price_stale:
+                    await self._execution.execute_timed_exits(market_index)
+                    await asyncio.sleep(self._config.main_loop_sleep)
+                    continue
+
+                markets = list(market_index.values())
                 balance = await self._client.get_balance()
+                self._portfolio.update_balance(balance)
 
                 entries = await self._strategy.scan_markets(btc_price, markets, balance)
 
+                await self._execution.execute_entries(entries)
+
                 edges_by_market: Dict[str, float] = {}
                 if btc_price is not None:
-                    for m in markets:
+                    for pos in self._position_manager.positions():
+                        m = market_index.get(pos.market_id)
+                        if m is None:
+                            continue
                         real_prob = (
                             0.0 if m.target_price <= 0 else min(max(btc_price / m.target_price, 0.0), 1.0)
                         )
-                        edge = real_prob - m.yes_price
-                        edges_by_market[m.market_id] = edge
+                        edges_by_market[m.market_id] = real_prob - m.yes_price
 
-                await self._execution.execute_entries(entries)
-                await self._execution.execute_exits(markets, edges_by_market)
+                await self._execution.execute_exits(market_index, edges_by_market)
+
+                if first_decision:
+                    first_decision = False
+                    self._logger.info(
+                        f"Time to first decision: {(time.perf_counter() - _PROCESS_START) * 1000:.0f}ms"
+                    )
             except Exception as e:
                 self._logger.error(f"Error in main loop: {e}")
 
             await asyncio.sleep(self._config.main_loop_sleep)
 
+        ready_task.cancel()
         self._logger.info("Main trading loop stopped")
 
     async def run(self):
         loop = asyncio.get_running_loop()
+        self._watchdog.install(loop)
 
         def _handle_signal():
             self._logger.info("Shutdown signal received")
@@ -91,22 +187,40 @@ class LimitlessBot:
             except NotImplementedError:
                 pass
 
-        feed_task = asyncio.create_task(self._start_binance_feed(), name="binance_feed")
-        discovery_task = asyncio.create_task(self._periodic_market_refresh(), name="market_refresh")
-        main_loop_task = asyncio.create_task(self._main_loop(), name="main_loop")
+        # Feed and discovery connect while the snapshot is being restored.
+        tasks = [
+            asyncio.create_task(self._start_binance_feed(), name="binance_feed"),
+            asyncio.create_task(self._periodic_market_refresh(), name="market_refresh"),
+            asyncio.create_task(self._analytics.run(), name="analytics"),
+        ]
+        if self._config.watchdog_interval > 0:
+            tasks.append(asyncio.create_task(self._watchdog.run(), name="loop_watchdog"))
+        if self._config.analytics_port > 0:
+            tasks.append(asyncio.create_task(self._analytics.serve(), name="analytics_endpoint"))
+        if self._config.analytics_snapshot_interval > 0:
+            tasks.append(asyncio.create_task(self._analytics.export_periodically(), name="analytics_export"))
+        await self._restore_snapshot()
+        tasks.append(asyncio.create_task(self._main_loop(), name="main_loop"))
+        if self._config.snapshot_interval > 0:
+            tasks.append(asyncio.create_task(self._periodic_snapshot(), name="snapshot"))
 
         await self._should_stop.wait()
 
         self._logger.info("Stopping tasks...")
+        self._watchdog.stop()
         await self._binance_feed.stop()
-        for task in (feed_task, discovery_task, main_loop_task):
+        for task in tasks:
             task.cancel()
-        await asyncio.gather(feed_task, discovery_task, main_loop_task, return_exceptions=True)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._save_snapshot()
         self._logger.info("Bot shutdown complete")
 
+    def start(self):
+        run_event_loop(self.run(), self._config, self._logger)
+
 
 def main():
-    asyncio.run(LimitlessBot().run())
+    LimitlessBot().start()
 
 
 if __name__ == "__main__":
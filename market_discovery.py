@@ -1,12 +1,14 @@
 import asyncio
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
 from limitless_client import LimitlessClient
 from config import Config
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MarketInfo:
     market_id: str
     title: str
@@ -14,6 +16,127 @@ class MarketInfo:
     no_price: float
     target_price: float
     expiry_time: str
+    expiry_ts: Optional[float] = None
+
+
+def _parse_expiry(expiry_time: str) -> Optional[float]:
+    if not expiry_time:
+        return None
+    try:
+        ts = float(expiry_time)
+    except ValueError:
+        try:
+            dt = datetime.fromisoformat(expiry_time.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    # Epochs above ~1e11 are in milliseconds.
+    return ts / 1000.0 if ts > 1e11 else ts
+
+
+# Key aliases seen across Limitless market payloads, in order of preference.
+_FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "title": ("title", "name"),
+    "status": ("status",),
+    "market_id": ("id", "market_id"),
+    "yes_price": ("yes_price", "price_yes", "yes", "bid_yes"),
+    "no_price": ("no_price", "price_no", "no", "bid_no"),
+    "target_price": ("target_price", "strike_price", "target"),
+    "expiry_time": ("expiry_time", "expiration", "end_time"),
+}
+
+_FIELDS: Tuple[str, ...] = tuple(_FIELD_ALIASES)
+_FIELD_COUNT = len(_FIELDS)
+
+_MAX_CACHED_SCHEMAS = 64
+
+
+class _SchemaPlan(NamedTuple):
+    # Fetches the preferred present alias of every resolvable field in one call.
+    getter: Optional[Callable[[Dict[str, Any]], Tuple[Any, ...]]]
+    # Field indexes the getter fills, in order; equals range(_FIELD_COUNT) when complete.
+    present: Tuple[int, ...]
+    # (field index, further present aliases) consulted only when the preferred value is falsy.
+    fallbacks: Tuple[Tuple[int, Tuple[str, ...]], ...]
+
+
+def _build_plan(schema: frozenset) -> _SchemaPlan:
+    present: List[int] = []
+    preferred: List[str] = []
+    fallbacks: List[Tuple[int, Tuple[str, ...]]] = []
+    for idx, field in enumerate(_FIELDS):
+        keys = [key for key in _FIELD_ALIASES[field] if key in schema]
+        if not keys:
+            continue
+        present.append(idx)
+        preferred.append(keys[0])
+        if len(keys) > 1:
+            fallbacks.append((idx, tuple(keys[1:])))
+
+    getter: Optional[Callable[[Dict[str, Any]], Tuple[Any, ...]]] = None
+    if len(preferred) == 1:
+        key = preferred[0]
+        getter = lambda payload: (payload[key],)
+    elif preferred:
+        getter = itemgetter(*preferred)
+    return _SchemaPlan(getter, tuple(present), tuple(fallbacks))
+
+
+class MarketPayloadDecoder:
+    """Resolves which key aliases a payload schema uses once, then reads fields directly."""
+
+    __slots__ = ("_plans", "_last_schema", "_last_plan")
+
+    def __init__(self):
+        self._plans: Dict[frozenset, _SchemaPlan] = {}
+        self._last_schema: Optional[frozenset] = None
+        self._last_plan: Optional[_SchemaPlan] = None
+
+    def _resolve(self, payload: Dict[str, Any]) -> _SchemaPlan:
+        # Market lists are almost always homogeneous, so compare against the
+        # previous schema before building a new key for the cache.
+        if self._last_plan is not None and payload.keys() == self._last_schema:
+            return self._last_plan
+
+        schema = frozenset(payload)
+        plan = self._plans.get(schema)
+        if plan is None:
+            if len(self._plans) >= _MAX_CACHED_SCHEMAS:
+                self._plans.clear()
+            plan = _build_plan(schema)
+            self._plans[schema] = plan
+
+        self._last_schema = schema
+        self._last_plan = plan
+        return plan
+
+    def decode(self, payload: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Return raw values in `_FIELDS` order, None where no alias holds a truthy value.
+
+        Matches a chain of `payload.get(a) or payload.get(b) ...` per field.
+        """
+        plan = self._resolve(payload)
+        values: Any = plan.getter(payload) if plan.getter is not None else ()
+        if len(values) != _FIELD_COUNT:
+            full: List[Any] = [None] * _FIELD_COUNT
+            for idx, value in zip(plan.present, values):
+                full[idx] = value
+            values = full
+        if plan.fallbacks:
+            for idx, keys in plan.fallbacks:
+                if values[idx]:
+                    continue
+                if not isinstance(values, list):
+                    values = list(values)
+                for key in keys:
+                    if payload[key]:
+                        values[idx] = payload[key]
+                        break
+        if not all(values):
+            values = [value if value else None for value in values]
+        return values
 
 
 class MarketDiscovery:
@@ -22,7 +145,23 @@ class MarketDiscovery:
         self._config = config
         self._logger = logger
         self._markets: Dict[str, MarketInfo] = {}
+        self._decoder = MarketPayloadDecoder()
         self._lock = asyncio.Lock()
+        self._loaded = asyncio.Event()
+        self._listeners: List[Any] = []
+
+    def add_listener(self, listener):
+        # Listeners receive `on_quotes(markets, book)`: only the records that
+        # are new or changed since the previous refresh, plus the full
+        # read-only book they now belong to.
+        self._listeners.append(listener)
+
+    def _notify(self, changed: List[MarketInfo]):
+        for listener in self._listeners:
+            try:
+                listener.on_quotes(changed, self._markets)
+            except Exception as e:
+                self._logger.error(f"Error in market listener {listener!r}: {e}")
 
     def _is_btc_market(self, title: str) -> bool:
         t = title.lower()
@@ -35,10 +174,14 @@ class MarketDiscovery:
     async def refresh_markets(self):
         markets_raw = await self._client.get_markets()
         filtered: Dict[str, MarketInfo] = {}
+        changed: List[MarketInfo] = []
+        previous = self._markets
+        decode = self._decoder.decode
         for m in markets_raw:
             try:
-                title = str(m.get("title") or m.get("name") or "")
-                status = str(m.get("status", "")).lower()
+                title, status, market_id, yes_price, no_price, target_price, expiry_time = decode(m)
+                title = str(title or "")
+                status = str(status or "").lower()
                 if status not in ("active", "open", "trading"):
                     continue
                 if not self._is_btc_market(title):
@@ -46,32 +189,72 @@ class MarketDiscovery:
                 if not self._is_1h_market(title):
                     continue
 
-                market_id = str(m.get("id") or m.get("market_id"))
                 if not market_id:
                     continue
+                market_id = str(market_id)
+
+                yes_price = float(yes_price)
+                no_price = float(no_price or (1.0 - yes_price))
+                target_price = float(target_price)
+                if yes_price <= 0 or target_price <= 0:
+                    self._logger.debug(
+                        f"Skipping market {market_id}: non-positive price yes={yes_price} target={target_price}"
+                    )
+                    continue
+                expiry_time = str(expiry_time or "")
 
-                yes_price = float(m.get("yes_price") or m.get("price_yes") or m.get("yes") or m.get("bid_yes"))
-                no_price = float(m.get("no_price") or m.get("price_no") or m.get("no") or m.get("bid_no") or (1.0 - yes_price))
-                target_price = float(m.get("target_price") or m.get("strike_price") or m.get("target"))
-                expiry_time = str(m.get("expiry_time") or m.get("expiration") or m.get("end_time") or "")
-
-                mi = MarketInfo(
-                    market_id=market_id,
-                    title=title,
-                    yes_price=yes_price,
-                    no_price=no_price,
-                    target_price=target_price,
-                    expiry_time=expiry_time,
-                )
+                # Records are immutable, so an unchanged market keeps its
+                # existing instance instead of allocating a new one.
+                mi = previous.get(market_id)
+                if (
+                    mi is None
+                    or mi.yes_price != yes_price
+                    or mi.no_price != no_price
+                    or mi.target_price != target_price
+                    or mi.expiry_time != expiry_time
+                    or mi.title != title
+                ):
+                    mi = MarketInfo(
+                        market_id=market_id,
+                        title=title,
+                        yes_price=yes_price,
+                        no_price=no_price,
+                        target_price=target_price,
+                        expiry_time=expiry_time,
+                        expiry_ts=_parse_expiry(expiry_time),
+                    )
+                    changed.append(mi)
                 filtered[market_id] = mi
             except Exception as e:
                 self._logger.error(f"Error parsing market: {e}")
 
         async with self._lock:
             self._markets = filtered
+        self._loaded.set()
+        if changed:
+            self._notify(changed)
 
         self._logger.info(f"Discovered {len(filtered)} active BTC 1H markets")
 
     async def get_markets(self) -> List[MarketInfo]:
         async with self._lock:
             return list(self._markets.values())
+
+    async def restore_markets(self, markets: List[MarketInfo]):
+        # Only fills the book if no live refresh has completed yet.
+        async with self._lock:
+            if self._loaded.is_set():
+                return
+            self._markets = {m.market_id: m for m in markets}
+        self._loaded.set()
+        self._notify(markets)
+        self._logger.info(f"Restored {len(markets)} BTC 1H markets from snapshot")
+
+    async def wait_for_markets(self):
+        await self._loaded.wait()
+
+    async def get_market_index(self) -> Dict[str, MarketInfo]:
+        # The mapping is replaced wholesale on refresh and never mutated, so
+        # callers may hold on to it as a read-only snapshot.
+        async with self._lock:
+            return self._markets
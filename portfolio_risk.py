@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from config import Config
+from market_discovery import MarketInfo
+from position_manager import Position
+
+
+UNDERLYING = "BTC"
+EXPIRY_BUCKET_SECONDS = 3600
+UNKNOWN_EXPIRY_BUCKET = -1
+
+
+@dataclass(slots=True)
+class _Exposure:
+    shares: float
+    notional: float
+    bucket: int
+    delta: float
+    mark: float
+
+
+def expiry_bucket(expiry_ts: Optional[float]) -> int:
+    if expiry_ts is None:
+        return UNKNOWN_EXPIRY_BUCKET
+    return int(expiry_ts // EXPIRY_BUCKET_SECONDS)
+
+
+class PortfolioRisk:
+    # Running portfolio totals, updated per fill and per changed quote so that
+    # limit checks before each order never walk the open positions.
+
+    def __init__(self, config: Config, logger):
+        self._config = config
+        self._logger = logger
+        self._equity = 0.0
+        self._by_market: Dict[str, _Exposure] = {}
+        self._exposure = 0.0
+        self._bucket_notional: Dict[int, float] = {}
+        self._delta: Dict[str, float] = {}
+        self._unrealized_pnl = 0.0
+        # Latest market book from discovery, used to mark new positions.
+        self._book: Dict[str, MarketInfo] = {}
+
+    def update_balance(self, balance: float):
+        # The exchange reports the available balance, which already excludes
+        # live open notional. Paper fills never touch the account, so there
+        # the balance is the whole equity. Equity is fixed here, once per
+        # tick: fills before the next refresh raise exposure without the
+        # stale balance dropping, which would otherwise loosen the limits.
+        if self._config.paper_trading:
+            self._equity = balance
+        else:
+            self._equity = balance + self._exposure
+
+    @property
+    def equity(self) -> float:
+        return self._equity
+
+    def on_position_opened(self, pos: Position):
+        if pos.market_id in self._by_market or pos.entry_price <= 0:
+            return
+        shares = pos.size / pos.entry_price
+        # Under the strategy's linear model, a YES share moves by 1/target per
+        # dollar of BTC, so that is the position's dollar delta per share.
+        delta = shares / pos.target_price if pos.target_price > 0 else 0.0
+        # Mark at the current quote; a restored position whose market is not
+        # in the book yet is marked when discovery first reports it.
+        quote = self._book.get(pos.market_id)
+        mark = quote.yes_price if quote is not None else pos.entry_price
+        exp = _Exposure(
+            shares=shares,
+            notional=pos.size,
+            bucket=expiry_bucket(pos.expiry_ts),
+            delta=delta,
+            mark=mark,
+        )
+        self._by_market[pos.market_id] = exp
+        self._exposure += exp.notional
+        self._unrealized_pnl += shares * (mark - pos.entry_price)
+        self._bucket_notional[exp.bucket] = self._bucket_notional.get(exp.bucket, 0.0) + exp.notional
+        self._delta[UNDERLYING] = self._delta.get(UNDERLYING, 0.0) + exp.delta
+        self._log_totals()
+
+    def on_position_closed(self, pos: Position):
+        exp = self._by_market.pop(pos.market_id, None)
+        if exp is None:
+            return
+        self._exposure -= exp.notional
+        remaining = self._bucket_notional.get(exp.bucket, 0.0) - exp.notional
+        if remaining <= 1e-9:
+            self._bucket_notional.pop(exp.bucket, None)
+        else:
+            self._bucket_notional[exp.bucket] = remaining
+        self._delta[UNDERLYING] = self._delta.get(UNDERLYING, 0.0) - exp.delta
+        self._unrealized_pnl -= exp.shares * (exp.mark - pos.entry_price)
+        if not self._by_market:
+            # Clear accumulated float drift once flat.
+            self._exposure = 0.0
+            self._unrealized_pnl = 0.0
+            self._delta[UNDERLYING] = 0.0
+        self._log_totals()
+
+    def on_quotes(self, markets: List[MarketInfo], book: Dict[str, MarketInfo]):
+        self._book = book
+        for m in markets:
+            exp = self._by_market.get(m.market_id)
+            if exp is None:
+                continue
+            self._unrealized_pnl += exp.shares * (m.yes_price - exp.mark)
+            exp.mark = m.yes_price
+
+    def clip_order(self, market: MarketInfo, size: float) -> float:
+        cfg = self._config
+        bucket = expiry_bucket(market.expiry_ts)
+        equity = self.equity
+        total_room = equity * cfg.max_portfolio_percent - self._exposure
+        bucket_room = equity * cfg.max_expiry_bucket_percent - self._bucket_notional.get(bucket, 0.0)
+        allowed = max(min(size, total_room, bucket_room), 0.0)
+        if allowed < size:
+            # Fully blocked entries repeat every loop, so keep those at debug.
+            log = self._logger.info if allowed > 0 else self._logger.debug
+            log(
+                f"Portfolio limit: market={market.market_id} requested={size:.4f} allowed={allowed:.4f} "
+                f"exposure={self._exposure:.4f} bucket_notional={self._bucket_notional.get(bucket, 0.0):.4f} "
+                f"equity={equity:.4f}"
+            )
+        return allowed
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "equity": self.equity,
+            "exposure": self._exposure,
+            "bucket_notional": {str(b): n for b, n in self._bucket_notional.items()},
+            "delta": dict(self._delta),
+            "unrealized_pnl": self._unrealized_pnl,
+        }
+
+    def _log_totals(self):
+        self._logger.info(
+            f"Portfolio: positions={len(self._by_market)} exposure={self._exposure:.4f} "
+            f"buckets={len(self._bucket_notional)} delta_{UNDERLYING}={self._delta.get(UNDERLYING, 0.0):.6f} "
+            f"unrealized_pnl={self._unrealized_pnl:.4f}"
+        )
@@ -1,17 +1,25 @@
 import time
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from config import Config
 from market_discovery import MarketInfo
+from scheduler import DeadlineScheduler
 
 
-@dataclass
+EXIT_PRE_EXPIRY = "pre_expiry"
+EXIT_MAX_HOLD = "max_hold"
+EXIT_SETTLEMENT = "settlement"
+
+
+@dataclass(frozen=True, slots=True)
 class Position:
     market_id: str
     entry_price: float
     size: float
     entry_time: float
+    expiry_ts: Optional[float] = None
+    target_price: float = 0.0
 
 
 class PositionManager:
@@ -19,6 +27,19 @@ class PositionManager:
         self._config = config
         self._logger = logger
         self._positions: Dict[str, Position] = {}
+        self._deadlines = DeadlineScheduler()
+        self._listeners: List[Any] = []
+
+    def add_listener(self, listener):
+        # Listeners receive `on_position_opened(pos)` and `on_position_closed(pos)`.
+        self._listeners.append(listener)
+
+    def _notify(self, event: str, pos: Position):
+        for listener in self._listeners:
+            try:
+                getattr(listener, event)(pos)
+            except Exception as e:
+                self._logger.error(f"Error in position listener {listener!r}: {e}")
 
     def has_position(self, market_id: str) -> bool:
         return market_id in self._positions
@@ -32,22 +53,64 @@ class PositionManager:
             entry_price=entry_price,
             size=size,
             entry_time=time.time(),
+            expiry_ts=market.expiry_ts,
+            target_price=market.target_price,
         )
         self._positions[market.market_id] = pos
+        self._schedule_deadlines(pos)
+        self._notify("on_position_opened", pos)
         self._logger.info(
             f"Opened position: market={market.market_id} size={size:.4f} entry_price={entry_price:.4f}"
         )
 
+    def restore_positions(self, positions: List[Position]):
+        for pos in positions:
+            if self.has_position(pos.market_id):
+                continue
+            self._positions[pos.market_id] = pos
+            self._schedule_deadlines(pos)
+            self._notify("on_position_opened", pos)
+            self._logger.info(
+                f"Restored position: market={pos.market_id} size={pos.size:.4f} entry_price={pos.entry_price:.4f}"
+            )
+
+    def _schedule_deadlines(self, pos: Position):
+        cfg = self._config
+        if cfg.max_holding_seconds > 0:
+            self._deadlines.schedule(pos.market_id, pos.entry_time + cfg.max_holding_seconds, EXIT_MAX_HOLD)
+        if pos.expiry_ts is None:
+            return
+        if cfg.pre_expiry_exit_seconds > 0:
+            self._deadlines.schedule(pos.market_id, pos.expiry_ts - cfg.pre_expiry_exit_seconds, EXIT_PRE_EXPIRY)
+        self._deadlines.schedule(pos.market_id, pos.expiry_ts + cfg.settlement_grace_seconds, EXIT_SETTLEMENT)
+
     def get_position(self, market_id: str) -> Optional[Position]:
         return self._positions.get(market_id)
 
+    def positions(self) -> List[Position]:
+        return list(self._positions.values())
+
     def close_position(self, market_id: str):
         if market_id in self._positions:
             pos = self._positions.pop(market_id)
+            self._deadlines.cancel(market_id)
+            self._notify("on_position_closed", pos)
             self._logger.info(
                 f"Closed position: market={market_id} size={pos.size:.4f} entry_price={pos.entry_price:.4f}"
             )
 
+    def due_exits(self, now: float) -> List[Tuple[Position, str]]:
+        due: List[Tuple[Position, str]] = []
+        for market_id, reason in self._deadlines.pop_due(now):
+            pos = self._positions.get(market_id)
+            if pos is not None:
+                due.append((pos, reason))
+        return due
+
+    def retry_exit(self, market_id: str, reason: str, deadline: float):
+        if market_id in self._positions:
+            self._deadlines.schedule(market_id, deadline, reason)
+
     def evaluate_exit(self, market: MarketInfo, current_yes_price: float, current_edge: float) -> Optional[Position]:
         pos = self.get_position(market.market_id)
         if not pos:
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Coroutine, Optional
+
+from config import Config
+
+
+class InstrumentedExecutor(ThreadPoolExecutor):
+    # Default executor that tracks submitted-but-unfinished work, so the
+    # watchdog can report queue depth without touching executor internals.
+
+    def __init__(self, max_workers: Optional[int] = None, thread_name_prefix: str = ""):
+        if max_workers is None:
+            # Same default as ThreadPoolExecutor, resolved here so it is known.
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._workers = max_workers
+        self._inflight = 0
+        self._inflight_lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._inflight_lock:
+            self._inflight += 1
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except Exception:
+            self._task_done(None)
+            raise
+        future.add_done_callback(self._task_done)
+        return future
+
+    def _task_done(self, _future):
+        with self._inflight_lock:
+            self._inflight -= 1
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    @property
+    def queued(self) -> int:
+        return max(self._inflight - self._workers, 0)
+
+
+class LoopWatchdog:
+    def __init__(self, config: Config, logger):
+        self._config = config
+        self._logger = logger
+        self._executor = InstrumentedExecutor(
+            max_workers=config.executor_workers or None,
+            thread_name_prefix="limitless-io",
+        )
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self._max_lag = 0.0
+
+        # The heartbeat is only refreshed once per probe, so a stall threshold
+        # at or below the probe interval would flag every normal wait.
+        self._stall_after = config.loop_stall_ms / 1000.0
+        if config.watchdog_interval > 0 and self._stall_after <= config.watchdog_interval:
+            self._stall_after = 2 * config.watchdog_interval
+            logger.warning(
+                f"LOOP_STALL_MS={config.loop_stall_ms:.0f} is not above WATCHDOG_INTERVAL="
+                f"{config.watchdog_interval}s, using {self._stall_after * 1000:.0f}ms instead"
+            )
+
+    def install(self, loop: asyncio.AbstractEventLoop):
+        loop.set_default_executor(self._executor)
+        if self._config.loop_debug:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self._config.slow_callback_ms / 1000.0
+            # asyncio reports slow callbacks on its own logger, which has no
+            # handlers; route it to ours so the reports reach LOG_FILE.
+            asyncio_logger = logging.getLogger("asyncio")
+            for handler in self._logger.handlers:
+                if handler not in asyncio_logger.handlers:
+                    asyncio_logger.addHandler(handler)
+            asyncio_logger.propagate = False
+        if self._config.watchdog_interval <= 0:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._monitor = threading.Thread(target=self._monitor_stalls, name="loop-watchdog", daemon=True)
+        self._monitor.start()
+
+    async def run(self):
+        interval = self._config.watchdog_interval
+        warn_after = self._config.loop_lag_warn_ms / 1000.0
+        last_report = time.monotonic()
+        while not self._stop.is_set():
+            started = time.monotonic()
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            lag = now - started - interval
+            self._max_lag = max(self._max_lag, lag)
+
+            if lag >= warn_after:
+                self._logger.warning(
+                    f"Event loop lag {lag * 1000:.0f}ms (executor inflight={self._executor.inflight} "
+                    f"queued={self._executor.queued})"
+                )
+            if now - last_report >= 60:
+                self._logger.info(
+                    f"Event loop health: max_lag={self._max_lag * 1000:.0f}ms tasks={len(asyncio.all_tasks())} "
+                    f"executor inflight={self._executor.inflight} queued={self._executor.queued}"
+                )
+                self._max_lag = 0.0
+                last_report = now
+
+    def _monitor_stalls(self):
+        # Runs in its own thread: a blocked loop cannot report on itself.
+        stall_after = self._stall_after
+        reported = False
+        while not self._stop.wait(self._config.watchdog_interval):
+            stalled_for = time.monotonic() - self._heartbeat
+            if stalled_for < stall_after:
+                reported = False
+                continue
+            if reported:
+                continue
+            reported = True
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<unavailable>\n"
+            self._logger.warning(
+                f"Event loop stalled for {stalled_for * 1000:.0f}ms "
+                f"(executor inflight={self._executor.inflight} queued={self._executor.queued}); "
+                f"loop thread stack:\n{stack}"
+            )
+
+    def stop(self):
+        self._stop.set()
+
+
+def run_event_loop(main: Coroutine, config: Config, logger):
+    loop_factory = None
+    if config.event_loop == "uvloop":
+        try:
+            import uvloop
+        except ImportError:
+            logger.warning("EVENT_LOOP=uvloop but uvloop is not installed, using the default asyncio loop")
+        else:
+            loop_factory = uvloop.new_event_loop
+    elif config.event_loop != "asyncio":
+        logger.warning(f"Unknown EVENT_LOOP={config.event_loop!r}, using the default asyncio loop")
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        logger.info(f"Starting event loop: {type(runner.get_loop()).__module__}")
+        runner.run(main)
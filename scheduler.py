@@ -0,0 +1,39 @@
+import heapq
+import itertools
+from typing import Dict, List, Tuple
+
+
+class DeadlineScheduler:
+    """Min-heap of per-key deadlines with lazy cancellation.
+
+    Cancelling a key drops its generation; heap entries from an older
+    generation are discarded when they surface instead of being searched for.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, int, str, str]] = []
+        self._seq = itertools.count()
+        self._generations = itertools.count()
+        self._live: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, key: str, deadline: float, tag: str):
+        generation = self._live.get(key)
+        if generation is None:
+            generation = next(self._generations)
+            self._live[key] = generation
+        heapq.heappush(self._heap, (deadline, next(self._seq), generation, key, tag))
+
+    def cancel(self, key: str):
+        self._live.pop(key, None)
+
+    def pop_due(self, now: float) -> List[Tuple[str, str]]:
+        due: List[Tuple[str, str]] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, generation, key, tag = heapq.heappop(heap)
+            if self._live.get(key) == generation:
+                due.append((key, tag))
+        return due
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import os
+import shutil
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, List, Optional, Type
+
+from config import Config
+from market_discovery import MarketInfo
+from position_manager import Position
+
+
+# Bump whenever a persisted record gains or loses a field. Older versions
+# still load; missing fields take their dataclass defaults.
+#   2: Position.target_price
+SNAPSHOT_VERSION = 2
+
+
+class SnapshotFormatError(Exception):
+    pass
+
+
+def _record(cls: Type, data: Dict[str, Any]):
+    known = {f.name for f in fields(cls)}
+    return cls(**{k: v for k, v in data.items() if k in known})
+
+
+@dataclass
+class Snapshot:
+    saved_at: float
+    btc_price: Optional[float] = None
+    btc_price_time: Optional[float] = None
+    markets: List[MarketInfo] = field(default_factory=list)
+    positions: List[Position] = field(default_factory=list)
+
+
+class SnapshotStore:
+    def __init__(self, config: Config, logger):
+        self._config = config
+        self._logger = logger
+        self._path = config.snapshot_file
+        self._skipped = 0
+
+    def _write(self, snapshot: Snapshot):
+        payload = {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": snapshot.saved_at,
+            "btc_price": snapshot.btc_price,
+            "btc_price_time": snapshot.btc_price_time,
+            "markets": [asdict(m) for m in snapshot.markets],
+            "positions": [asdict(p) for p in snapshot.positions],
+        }
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, self._path)
+
+    def _records(self, cls: Type, rows: List[Dict[str, Any]]) -> List[Any]:
+        records = []
+        for row in rows:
+            try:
+                records.append(_record(cls, row))
+            except TypeError as e:
+                self._skipped += 1
+                self._logger.error(f"Skipping unreadable {cls.__name__} in snapshot: {row!r} ({e})")
+        return records
+
+    def _read(self) -> Optional[Snapshot]:
+        try:
+            with open(self._path) as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            raise SnapshotFormatError(f"invalid JSON: {e}") from e
+        self._skipped = 0
+        version = payload.get("version")
+        if not isinstance(version, int) or version > SNAPSHOT_VERSION:
+            raise SnapshotFormatError(f"unsupported version {version!r}")
+        return Snapshot(
+            saved_at=float(payload["saved_at"]),
+            btc_price=payload.get("btc_price"),
+            btc_price_time=payload.get("btc_price_time"),
+            markets=self._records(MarketInfo, payload.get("markets", [])),
+            positions=self._records(Position, payload.get("positions", [])),
+        )
+
+    def _set_aside(self, keep_original: bool = False) -> str:
+        # Keep a snapshot we could not fully parse so its positions are not
+        # lost when the next periodic save replaces the file.
+        bad_path = f"{self._path}.unreadable-{int(time.time() * 1000)}"
+        if keep_original:
+            shutil.copyfile(self._path, bad_path)
+        else:
+            os.replace(self._path, bad_path)
+        return bad_path
+
+    async def save(self, snapshot: Snapshot):
+        try:
+            await asyncio.to_thread(self._write, snapshot)
+        except Exception as e:
+            self._logger.error(f"Error writing snapshot {self._path}: {e}")
+
+    async def load(self) -> Optional[Snapshot]:
+        try:
+            snapshot = await asyncio.to_thread(self._read)
+        except Exception as e:
+            try:
+                bad_path = await asyncio.to_thread(self._set_aside)
+            except OSError as move_error:
+                bad_path = f"<not moved: {move_error}>"
+            self._logger.error(
+                f"Error reading snapshot {self._path}: {e}; kept as {bad_path}, positions NOT restored"
+            )
+            return None
+        if snapshot is None:
+            return None
+        if self._skipped:
+            try:
+                bad_path = await asyncio.to_thread(self._set_aside, True)
+                self._logger.error(f"Snapshot had {self._skipped} unreadable records; original kept as {bad_path}")
+            except OSError as e:
+                self._logger.error(f"Could not keep a copy of snapshot {self._path}: {e}")
+
+        # Positions are real holdings and are always restored; the price and
+        # market book are only trusted while they are fresh.
+        max_age = self._config.snapshot_max_age
+        now = time.time()
+        if snapshot.btc_price_time is None or now - snapshot.btc_price_time > max_age:
+            snapshot.btc_price = None
+            snapshot.btc_price_time = None
+        if now - snapshot.saved_at > max_age:
+            snapshot.markets = []
+        return snapshot
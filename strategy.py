@@ -1,3 +1,4 @@
+import time
 from typing import Optional, List, Tuple, Dict
 
 from config import Config
@@ -34,6 +35,7 @@ class StrategyEngine:
             return []
 
         tradable: List[Tuple[MarketInfo, float, float]] = []
+        entry_cutoff = time.time() + self._config.pre_expiry_exit_seconds
         for m in markets:
             real_prob = self._compute_real_probability(btc_price, m.target_price)
             edge = self._compute_edge(real_prob, m.yes_price)
@@ -46,6 +48,9 @@ class StrategyEngine:
             if self._positions.has_position(m.market_id):
                 self._logger.debug(f"Already in position for {m.market_id}, skipping entry")
                 continue
+            if m.expiry_ts is not None and m.expiry_ts <= entry_cutoff:
+                self._logger.debug(f"Market {m.market_id} is inside the pre-expiry window, skipping entry")
+                continue
 
             size = self._risk.get_position_size(balance, edge)
             if size <= 0: